@@ -1,13 +1,100 @@
+from typing import ClassVar
+
+from dynamus_agent.agents.exceptions import AgentRegistryError
+
+_LEAF = None
+_MISS = object()
+
+
 class AgentRegistry:
-    _registry = {}
+    _registry: ClassVar[dict] = {}
+    _interned: ClassVar[dict] = {}
+    _by_index: ClassVar[list] = []
+    _trie: ClassVar[dict] = {}
+    _by_action: ClassVar[dict] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        # Cada subclase tiene su propio registry (no comparte el del padre)
+        super().__init_subclass__(**kwargs)
+        cls._registry = {}
+        cls._interned = {}
+        cls._by_index = []
+        cls._trie = {}
+        cls._by_action = {}
 
     @classmethod
     def register(cls, agent_cls):
-        cls._registry[agent_cls.id] = agent_cls()
+        agent = agent_cls()
+        agent_id = agent_cls.id
+
+        # ids jerárquicos ("domain.subdomain.name") -> ruta en el trie; se calcula
+        # antes de tocar los índices. Ids no str ocupan un único nivel
+        path = agent_id.split(".") if isinstance(agent_id, str) else (agent_id,)
+
+        index = cls._interned.get(agent_id)
+        if index is None:
+            index = len(cls._by_index)
+            cls._interned[agent_id] = index
+            cls._by_index.append(agent)
+        else:
+            # Re-registro: quitar las acciones de la instancia anterior
+            previous = cls._by_index[index]
+            for action in getattr(previous, "actions", ()):
+                if cls._by_action.get(action) is previous:
+                    del cls._by_action[action]
+            cls._by_index[index] = agent
+        cls._registry[agent_id] = agent
+
+        # Índice inverso acción -> agente
+        for action in getattr(agent, "actions", ()):
+            cls._by_action[action] = agent
+
+        # Trie de dicts anidados
+        node = cls._trie
+        for segment in path:
+            node = node.setdefault(segment, {})
+        node[_LEAF] = agent
+
+        return index
+
+    @classmethod
+    def register_all(cls, *agent_classes):
+        return [cls.register(agent_cls) for agent_cls in agent_classes]
+
+    @classmethod
+    def get(cls, agent_id, _miss=_MISS):
+        index = cls._interned.get(agent_id, _miss)
+        return None if index is _miss else cls._by_index[index]
+
+    @classmethod
+    def find(cls, prefix):
+        node = cls._trie
+        for segment in prefix.split("."):
+            node = node.get(segment)
+            if node is None:
+                return []
+
+        agents = []
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            for key, value in node.items():
+                if key is _LEAF:
+                    agents.append(value)
+                else:
+                    pending.append(value)
+        return agents
+
+    @classmethod
+    def for_action(cls, action):
+        return cls._by_action.get(action)
 
     @classmethod
-    def get(cls, agent_id):
-        return cls._registry.get(agent_id)
+    def dispatch(cls, action, data):
+        agent = cls._by_action.get(action)
+        if agent is None:
+            raise AgentRegistryError(f"No agent registered for action: {action}")
+        return agent.execute(action, data)
 
     @classmethod
     def all(cls):
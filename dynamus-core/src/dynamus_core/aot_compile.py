@@ -0,0 +1,47 @@
+# ============================================
+# dynamus/core/aot_compile.py
+# Compilación anticipada de plantillas Jinja2 a módulos Python
+# ============================================
+#
+# Uso:
+#     python -m dynamus_core.aot_compile templates/ dynamus_core/_compiled/
+#
+# Los módulos generados se cargan pasando compiled_dir a
+# TemplateBasedGenerator. Volver a ejecutar tras modificar cualquier .j2.
+
+import argparse
+import sys
+from typing import List, Optional
+
+from jinja2 import Environment, FileSystemLoader
+
+from dynamus_core.framework import JINJA_ENV_OPTIONS, JINJA_FILTERS
+
+
+def compile_templates(templates_dir: str, output_dir: str) -> None:
+    """Compila todas las plantillas .j2 del directorio a módulos Python"""
+    env = Environment(loader=FileSystemLoader(templates_dir), **JINJA_ENV_OPTIONS)
+    env.filters.update(JINJA_FILTERS)
+    env.compile_templates(
+        output_dir,
+        zip=None,
+        filter_func=lambda name: name.endswith('.j2'),
+        ignore_errors=False
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m dynamus_core.aot_compile",
+        description="Precompila plantillas Jinja2 a módulos Python"
+    )
+    parser.add_argument("templates_dir", help="Directorio con plantillas .j2")
+    parser.add_argument("output_dir", help="Directorio destino de los módulos compilados")
+    args = parser.parse_args(argv)
+    
+    compile_templates(args.templates_dir, args.output_dir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
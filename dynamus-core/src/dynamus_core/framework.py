@@ -4,19 +4,202 @@
 # ============================================
 
 import os
-import json
-from typing import Dict, Any, List, Optional, Type, Union
+import re
+import sys
+import string
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache, reduce
+from operator import or_
+from typing import (
+    Dict, Any, Iterator, List, Mapping, Optional, Protocol, Tuple, Union, runtime_checkable
+)
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from jinja2 import Environment, FileSystemLoader, Template
+from enum import IntEnum
+from jinja2 import (
+    BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader,
+    ModuleLoader, Template
+)
 from pathlib import Path
-import importlib.util
+from types import MappingProxyType
 
-@dataclass
+# ============================================
+# Tipos de campo
+# ============================================
+
+class FieldType(IntEnum):
+    """Tipos de campo soportados"""
+    STRING = 1
+    TEXT = 2
+    INTEGER = 3
+    FLOAT = 4
+    BOOLEAN = 5
+    DATETIME = 6
+    DATE = 7
+    EMAIL = 8
+    URL = 9
+    UUID = 10
+    JSON = 11
+    
+    def __str__(self) -> str:
+        return self.name.lower()
+    
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+    
+    # Compatibilidad: FieldType.STRING == "string" (como cuando type era str)
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, str):
+            return str(self) == other.lower()
+        return int.__eq__(self, other)
+    
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    __hash__ = int.__hash__
+    
+    @classmethod
+    def parse(cls, value: Any) -> Optional["FieldType"]:
+        """Convierte un nombre de tipo ("string", "Integer", ...) a FieldType; None si es desconocido"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return _parse_field_type(value)
+        # Valor numérico (p.ej. un FieldType serializado con asdict + json)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls._value2member_map_.get(value)
+        return None
+
+_FIELD_TYPES_BY_NAME: Dict[str, FieldType] = {ft.name.lower(): ft for ft in FieldType}
+
+@lru_cache(maxsize=1024)
+def _parse_field_type(value: str) -> Optional[FieldType]:
+    return _FIELD_TYPES_BY_NAME.get(value.lower())
+
+def _type_table(mapping: Dict[FieldType, str]) -> tuple:
+    """Tabla indexada por el valor del FieldType (la posición 0 no se usa)"""
+    return (None,) + tuple(mapping[ft] for ft in FieldType)
+
+_PY_TYPES = _type_table({
+    FieldType.STRING: "str",
+    FieldType.TEXT: "str",
+    FieldType.INTEGER: "int",
+    FieldType.FLOAT: "float",
+    FieldType.BOOLEAN: "bool",
+    FieldType.DATETIME: "datetime",
+    FieldType.DATE: "date",
+    FieldType.EMAIL: "EmailStr",
+    FieldType.URL: "HttpUrl",
+    FieldType.UUID: "UUID",
+    FieldType.JSON: "str",
+})
+
+_SQLALCHEMY_TYPES = _type_table({
+    FieldType.STRING: "String(255)",
+    FieldType.TEXT: "Text",
+    FieldType.INTEGER: "Integer",
+    FieldType.FLOAT: "Float",
+    FieldType.BOOLEAN: "Boolean",
+    FieldType.DATETIME: "DateTime",
+    FieldType.DATE: "Date",
+    FieldType.EMAIL: "String(255)",
+    FieldType.URL: "String(255)",
+    FieldType.UUID: "UUID(as_uuid=True)",
+    FieldType.JSON: "JSON",
+})
+
+# ============================================
+# Filtros Jinja2 (funciones puras, memoizadas)
+# ============================================
+
+# Posiciones de corte: minúscula/dígito -> mayúscula, o antes de "Xy..." (HTTPResponse)
+_SNAKE_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=.)(?=[A-Z][a-z])')
+
+@lru_cache(maxsize=1024)
+def to_snake_case(text: str) -> str:
+    """Convierte a snake_case"""
+    return _SNAKE_RE.sub('_', text).lower()
+
+@lru_cache(maxsize=1024)
+def to_camel_case(text: str) -> str:
+    """Convierte a camelCase"""
+    components = text.split('_')
+    return components[0] + ''.join(x.title() for x in components[1:])
+
+@lru_cache(maxsize=1024)
+def to_pascal_case(text: str) -> str:
+    """Convierte a PascalCase"""
+    return ''.join(x.title() for x in text.split('_'))
+
+@lru_cache(maxsize=1024)
+def pluralize(text: str) -> str:
+    """Pluraliza una palabra (básico)"""
+    if text.endswith('y'):
+        return text[:-1] + 'ies'
+    elif text.endswith(('s', 'sh', 'ch', 'x', 'z')):
+        return text + 'es'
+    else:
+        return text + 's'
+
+def map_type_to_python(field_type: Union["FieldType", str]) -> str:
+    """Mapea tipos a Python/Pydantic"""
+    ft = FieldType.parse(field_type)
+    return _PY_TYPES[ft] if ft is not None else "str"
+
+def map_type_to_sqlalchemy(field_type: Union["FieldType", str]) -> str:
+    """Mapea tipos a SQLAlchemy"""
+    ft = FieldType.parse(field_type)
+    return _SQLALCHEMY_TYPES[ft] if ft is not None else "String(255)"
+
+JINJA_FILTERS = {
+    'snake_case': to_snake_case,
+    'camel_case': to_camel_case,
+    'pascal_case': to_pascal_case,
+    'pluralize': pluralize,
+    'python_type': map_type_to_python,
+    'sqlalchemy_type': map_type_to_sqlalchemy,
+}
+
+# Opciones compartidas por el generador y la compilación anticipada (aot_compile)
+JINJA_ENV_OPTIONS: Dict[str, Any] = {
+    "trim_blocks": True,
+    "lstrip_blocks": True,
+}
+
+def _walk_templates(directory: str):
+    """Recorre el directorio con os.scandir y produce las rutas de archivos .j2"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_templates(entry.path)
+            elif entry.name.endswith('.j2'):
+                yield entry.path
+
+# Bits de features con soporte específico en las plantillas
+_FEATURE_AUTH = 1
+_FEATURE_PAGINATION = 2
+_FEATURE_SOFT_DELETE = 4
+
+_FEATURE_BITS: Dict[str, int] = {
+    'auth': _FEATURE_AUTH,
+    'pagination': _FEATURE_PAGINATION,
+    'soft_delete': _FEATURE_SOFT_DELETE,
+}
+
+def _features_to_mask(features) -> int:
+    """Empaqueta las features conocidas en bits; las desconocidas no aportan bit"""
+    return reduce(or_, (_FEATURE_BITS.get(f, 0) for f in features), 0)
+
+# slots=True solo existe desde Python 3.10; en 3.9 se usan dataclasses normales
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class FieldDefinition:
     """Definición de un campo de entidad"""
     name: str
-    type: str
+    type: Union[FieldType, str]
     description: str = ""
     nullable: bool = True
     unique: bool = False
@@ -25,10 +208,38 @@ class FieldDefinition:
     default: Any = None
     validation_rules: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        # Tipos conocidos -> FieldType; los desconocidos se conservan como str
+        field_type = FieldType.parse(self.type)
+        if field_type is not None:
+            self.type = field_type
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertir a diccionario para serialización (type como nombre, no como int)"""
+        return {
+            "name": self.name,
+            "type": str(self.type) if isinstance(self.type, FieldType) else self.type,
+            "description": self.description,
+            "nullable": self.nullable,
+            "unique": self.unique,
+            "index": self.index,
+            "primary_key": self.primary_key,
+            "default": self.default,
+            "validation_rules": self.validation_rules,
+            "metadata": self.metadata
+        }
 
 @dataclass
 class EntityDefinition:
-    """Definición completa de una entidad"""
+    """Definición completa de una entidad
+
+    Las particiones de campos y el contexto de plantilla se cachean en la
+    instancia. Reasignar un atributo (name, table_name, fields, ...) los
+    invalida automáticamente; las mutaciones in situ (fields.append, cambiar
+    un FieldDefinition existente) requieren llamar a _invalidate().
+    """
+    # Sin slots: los cached_property necesitan __dict__
     name: str
     fields: List[FieldDefinition]
     table_name: Optional[str] = None
@@ -37,8 +248,89 @@ class EntityDefinition:
     indexes: List[Dict[str, Any]] = field(default_factory=list)
     constraints: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @cached_property
+    def _partitions(self) -> Dict[str, Any]:
+        """Clasifica los campos en una sola pasada"""
+        partitions: Dict[str, Any] = {
+            "primary_key": None,
+            "required": [],
+            "optional": [],
+            "unique": [],
+            "indexed": [],
+            "string": [],
+            "numeric": [],
+        }
+        for f in self.fields:
+            if f.primary_key and partitions["primary_key"] is None:
+                partitions["primary_key"] = f
+            partitions["optional" if f.nullable else "required"].append(f)
+            if f.unique:
+                partitions["unique"].append(f)
+            if f.index:
+                partitions["indexed"].append(f)
+            if f.type is FieldType.STRING:
+                partitions["string"].append(f)
+            elif f.type is FieldType.INTEGER or f.type is FieldType.FLOAT:
+                partitions["numeric"].append(f)
+        return partitions
+    
+    @cached_property
+    def _template_context(self) -> Mapping[str, Any]:
+        """Variables de plantilla que dependen solo de la entidad (solo lectura)"""
+        return MappingProxyType({
+            "entity": self,
+            "entity_name": self.name,
+            "entity_name_lower": self.name.lower(),
+            "table_name": self.table_name or f"{self.name.lower()}s",
+            "fields": self.fields,
+            "primary_key_field": self.primary_key_field,
+            "required_fields": self.required_fields,
+            "optional_fields": self.optional_fields,
+            "unique_fields": self.unique_fields,
+            "indexed_fields": self.indexed_fields,
+            "string_fields": self.string_fields,
+            "numeric_fields": self.numeric_fields,
+        })
+    
+    def _invalidate(self):
+        """Descarta los datos derivados cacheados (llamar tras modificar la entidad)"""
+        self.__dict__.pop("_partitions", None)
+        self.__dict__.pop("_template_context", None)
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        self._invalidate()
+    
+    @property
+    def primary_key_field(self) -> Optional[FieldDefinition]:
+        return self._partitions["primary_key"]
+    
+    @property
+    def required_fields(self) -> List[FieldDefinition]:
+        return self._partitions["required"]
+    
+    @property
+    def optional_fields(self) -> List[FieldDefinition]:
+        return self._partitions["optional"]
+    
+    @property
+    def unique_fields(self) -> List[FieldDefinition]:
+        return self._partitions["unique"]
+    
+    @property
+    def indexed_fields(self) -> List[FieldDefinition]:
+        return self._partitions["indexed"]
+    
+    @property
+    def string_fields(self) -> List[FieldDefinition]:
+        return self._partitions["string"]
+    
+    @property
+    def numeric_fields(self) -> List[FieldDefinition]:
+        return self._partitions["numeric"]
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class GenerationContext:
     """Contexto para generación de código"""
     entity: EntityDefinition
@@ -48,10 +340,33 @@ class GenerationContext:
     features: List[str] = field(default_factory=list)
     config: Dict[str, Any] = field(default_factory=dict)
     output_path: str = "./generated"
+    
+    @property
+    def feature_mask(self) -> int:
+        """Features conocidas empaquetadas en bits (calculado sobre features actuales)"""
+        return _features_to_mask(self.features)
+
+def _parse_output_pattern(output_pattern: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+    """Descompone el patrón en (literal, clave); None si requiere str.format completo"""
+    parts = []
+    try:
+        for literal, key, format_spec, conversion in string.Formatter().parse(output_pattern):
+            if format_spec or conversion or (key is not None and not key.isidentifier()):
+                return None
+            parts.append((literal, key))
+    except ValueError:
+        # Llaves desbalanceadas: str.format fallará al renderizar, no al construir
+        return None
+    return parts
 
 class CodeTemplate:
     """Representación de una plantilla de código"""
     
+    __slots__ = (
+        'name', 'template_path', 'output_pattern', 'dependencies',
+        '_template', '_out_cache', '_pattern_parts'
+    )
+    
     def __init__(self, name: str, template_path: str, output_pattern: str, 
                  dependencies: List[str] = None):
         self.name = name
@@ -59,149 +374,173 @@ class CodeTemplate:
         self.output_pattern = output_pattern
         self.dependencies = dependencies or []
         self._template: Optional[Template] = None
+        self._out_cache: Dict[tuple, str] = {}
+        self._pattern_parts = _parse_output_pattern(output_pattern)
     
     def load_template(self, template_loader: Environment):
         """Carga la plantilla Jinja2"""
         self._template = template_loader.get_template(self.template_path)
     
-    def render(self, context: Dict[str, Any]) -> str:
+    def render(self, context: Mapping[str, Any]) -> str:
         """Renderiza la plantilla con el contexto dado"""
         if not self._template:
             raise ValueError(f"Template {self.name} not loaded")
-        return self._template.render(**context)
+        return self._template.render(context)
     
     def get_output_path(self, context: GenerationContext) -> str:
         """Genera la ruta de salida basada en el patrón"""
         entity_name = context.entity.name.lower()
-        return self.output_pattern.format(
-            entity_name=entity_name,
-            framework=context.framework,
-            architecture=context.architecture
-        )
+        key = (entity_name, context.framework, context.architecture)
+        output_path = self._out_cache.get(key)
+        if output_path is None:
+            keys = {
+                "entity_name": entity_name,
+                "framework": context.framework,
+                "architecture": context.architecture
+            }
+            if self._pattern_parts is None:
+                output_path = self.output_pattern.format(**keys)
+            else:
+                output_path = ''.join(
+                    literal if name is None else literal + keys[name]
+                    for literal, name in self._pattern_parts
+                )
+            self._out_cache[key] = output_path
+        return output_path
 
-class CodeGenerator(ABC):
-    """Generador base de código"""
+@runtime_checkable
+class CodeGenerator(Protocol):
+    """Interfaz (estructural) de un generador de código"""
     
-    @abstractmethod
     def generate(self, context: GenerationContext) -> Dict[str, str]:
         """Genera código basado en el contexto"""
-        pass
+        ...
     
-    @abstractmethod
     def get_supported_frameworks(self) -> List[str]:
         """Retorna frameworks soportados"""
-        pass
+        ...
     
-    @abstractmethod
     def get_dependencies(self, context: GenerationContext) -> List[str]:
         """Retorna dependencias necesarias"""
-        pass
+        ...
 
-class TemplateBasedGenerator(CodeGenerator):
-    """Generador basado en plantillas Jinja2"""
+class TemplateBasedGenerator(ABC):
+    """Generador basado en plantillas Jinja2 (cumple CodeGenerator)"""
+    
+    # Plantillas ya cargadas, compartidas entre instancias equivalentes:
+    # misma clase (patrones de salida, filtros) y mismo entorno Jinja2
+    _templates_cache: Dict[tuple, Dict[str, CodeTemplate]] = {}
+    
+    # Instancias reutilizables por (clase, directorio, opciones), ver for_dir()
+    _instances: Dict[tuple, "TemplateBasedGenerator"] = {}
+    
+    @classmethod
+    def for_dir(cls, templates_dir: str, **kwargs) -> "TemplateBasedGenerator":
+        """Retorna el generador cacheado para el directorio y opciones, creándolo si no existe"""
+        key = (cls, str(Path(templates_dir).resolve()), tuple(sorted(kwargs.items())))
+        instance = cls._instances.get(key)
+        if instance is None:
+            instance = cls(templates_dir, **kwargs)
+            cls._instances[key] = instance
+        return instance
     
-    def __init__(self, templates_dir: str):
-        self.templates_dir = Path(templates_dir)
-        self.templates: Dict[str, CodeTemplate] = {}
+    def __init__(self, templates_dir: str, cache_dir: Optional[str] = ".jinja_cache",
+                 compiled_dir: Optional[str] = None):
+        if getattr(self, '_initialized', False):
+            return
+        
+        # Rutas absolutas: las plantillas se compilan de forma diferida y el
+        # directorio de trabajo puede cambiar después de la construcción
+        self.templates_dir = Path(templates_dir).resolve()
+        if compiled_dir:
+            compiled_dir = str(Path(compiled_dir).resolve())
+        
+        # Contextos de framework/features reutilizables entre llamadas a generate()
+        self._static_contexts: Dict[tuple, Mapping[str, Any]] = {}
+        self._relevant_templates: Dict[str, Mapping[str, CodeTemplate]] = {}
+        
+        # Cache de bytecode persistente entre procesos (ruta absoluta: Jinja2
+        # escribe en cada compilación y el directorio de trabajo puede cambiar)
+        bytecode_cache = None
+        if cache_dir:
+            cache_dir = str(Path(cache_dir).resolve())
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(directory=cache_dir)
+        
+        # Plantillas precompiladas (python -m dynamus_core.aot_compile) con
+        # fallback a los .j2 si no existe el módulo compilado
+        loader: BaseLoader = FileSystemLoader(str(self.templates_dir))
+        if compiled_dir and Path(compiled_dir).is_dir():
+            loader = ChoiceLoader([ModuleLoader(compiled_dir), loader])
+        
         self.jinja_env = Environment(
-            loader=FileSystemLoader(str(self.templates_dir)),
-            trim_blocks=True,
-            lstrip_blocks=True
+            loader=loader,
+            bytecode_cache=bytecode_cache,
+            **JINJA_ENV_OPTIONS
         )
         
         # Agregar filtros personalizados
         self._setup_jinja_filters()
         
-        # Cargar plantillas
-        self._load_templates()
+        # Cargar plantillas (una sola vez por clase, directorio y entorno)
+        cache_key = (
+            type(self),
+            str(self.templates_dir),
+            cache_dir or None,
+            compiled_dir or None,
+        )
+        cached_templates = self._templates_cache.get(cache_key)
+        if cached_templates is None:
+            self.templates: Dict[str, CodeTemplate] = {}
+            self._load_templates()
+            self._templates_cache[cache_key] = self.templates
+        else:
+            self.templates = cached_templates
+        
+        self._initialized = True
+    
+    @abstractmethod
+    def get_supported_frameworks(self) -> List[str]:
+        """Retorna frameworks soportados"""
+        pass
+    
+    @abstractmethod
+    def get_dependencies(self, context: GenerationContext) -> List[str]:
+        """Retorna dependencias necesarias"""
+        pass
     
     def _setup_jinja_filters(self):
         """Configura filtros personalizados para Jinja2"""
-        
-        def to_snake_case(text: str) -> str:
-            """Convierte a snake_case"""
-            import re
-            s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', text)
-            return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
-        
-        def to_camel_case(text: str) -> str:
-            """Convierte a camelCase"""
-            components = text.split('_')
-            return components[0] + ''.join(x.title() for x in components[1:])
-        
-        def to_pascal_case(text: str) -> str:
-            """Convierte a PascalCase"""
-            return ''.join(x.title() for x in text.split('_'))
-        
-        def pluralize(text: str) -> str:
-            """Pluraliza una palabra (básico)"""
-            if text.endswith('y'):
-                return text[:-1] + 'ies'
-            elif text.endswith(('s', 'sh', 'ch', 'x', 'z')):
-                return text + 'es'
-            else:
-                return text + 's'
-        
-        def map_type_to_python(field_type: str) -> str:
-            """Mapea tipos a Python/Pydantic"""
-            type_mapping = {
-                "string": "str",
-                "text": "str",
-                "integer": "int", 
-                "float": "float",
-                "boolean": "bool",
-                "datetime": "datetime",
-                "date": "date",
-                "email": "EmailStr",
-                "url": "HttpUrl",
-                "uuid": "UUID"
-            }
-            return type_mapping.get(field_type.lower(), "str")
-        
-        def map_type_to_sqlalchemy(field_type: str) -> str:
-            """Mapea tipos a SQLAlchemy"""
-            type_mapping = {
-                "string": "String(255)",
-                "text": "Text",
-                "integer": "Integer",
-                "float": "Float", 
-                "boolean": "Boolean",
-                "datetime": "DateTime",
-                "date": "Date",
-                "email": "String(255)",
-                "url": "String(255)",
-                "uuid": "UUID(as_uuid=True)",
-                "json": "JSON"
-            }
-            return type_mapping.get(field_type.lower(), "String(255)")
-        
-        # Registrar filtros
-        self.jinja_env.filters['snake_case'] = to_snake_case
-        self.jinja_env.filters['camel_case'] = to_camel_case
-        self.jinja_env.filters['pascal_case'] = to_pascal_case
-        self.jinja_env.filters['pluralize'] = pluralize
-        self.jinja_env.filters['python_type'] = map_type_to_python
-        self.jinja_env.filters['sqlalchemy_type'] = map_type_to_sqlalchemy
+        self.jinja_env.filters.update(JINJA_FILTERS)
     
     def _load_templates(self):
-        """Carga todas las plantillas del directorio"""
+        """Registra las plantillas del directorio (la compilación es diferida)"""
+        templates_dir = str(self.templates_dir)
+        
         # Buscar archivos .j2 en el directorio de plantillas
-        for template_file in self.templates_dir.rglob("*.j2"):
-            relative_path = template_file.relative_to(self.templates_dir)
-            template_name = str(relative_path).replace('.j2', '')
+        for template_file in _walk_templates(templates_dir):
+            # Jinja2 usa "/" como separador en los nombres de plantilla
+            relative_path = os.path.relpath(template_file, templates_dir).replace(os.sep, '/')
+            template_name = relative_path[:-len('.j2')]
             
             # Generar patrón de salida basado en la estructura
             output_pattern = self._generate_output_pattern(template_name)
             
             template = CodeTemplate(
                 name=template_name,
-                template_path=str(relative_path),
+                template_path=relative_path,
                 output_pattern=output_pattern
             )
             
-            template.load_template(self.jinja_env)
             self.templates[template_name] = template
     
+    def _get_template(self, template_name: str) -> CodeTemplate:
+        """Obtiene una plantilla, compilándola la primera vez que se usa"""
+        template = self.templates[template_name]
+        if template._template is None:
+            template.load_template(self.jinja_env)
+        return template
+    
     def _generate_output_pattern(self, template_name: str) -> str:
         """Genera patrón de salida para una plantilla"""
         # Mapear nombres de plantillas a rutas de salida
@@ -226,64 +565,118 @@ class TemplateBasedGenerator(CodeGenerator):
         # Preparar contexto para plantillas
         template_context = self._prepare_template_context(context)
         
-        # Filtrar plantillas relevantes
-        relevant_templates = self._get_relevant_templates(context)
+        # Filtrar y compilar plantillas relevantes (en el hilo principal)
+        templates = self._load_relevant_templates(context)
+        if not templates:
+            return generated_files
         
-        # Generar código para cada plantilla
-        for template_name, template in relevant_templates.items():
-            try:
-                # Renderizar plantilla
-                code = template.render(template_context)
-                
-                # Obtener ruta de salida
-                output_path = template.get_output_path(context)
+        def render_one(template: CodeTemplate):
+            return template.get_output_path(context), template.render(template_context)
+        
+        # Generar código para cada plantilla en paralelo
+        max_workers = min(8, len(templates))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(template, executor.submit(render_one, template)) for template in templates]
+            
+            # Recolectar en orden de envío para mantener un resultado determinista
+            for template, future in futures:
+                try:
+                    output_path, code = future.result()
+                except Exception as e:
+                    raise RuntimeError(f"Error generando {template.name}: {e}")
                 
                 generated_files[output_path] = code
-                
-            except Exception as e:
-                raise RuntimeError(f"Error generando {template_name}: {e}")
         
         return generated_files
     
-    def _prepare_template_context(self, context: GenerationContext) -> Dict[str, Any]:
-        """Prepara el contexto para las plantillas"""
+    def generate_iter(self, context: GenerationContext) -> Iterator[Tuple[str, bytes]]:
+        """Genera archivos uno a uno como (ruta, contenido UTF-8) sin retenerlos en memoria"""
         
-        entity = context.entity
+        template_context = self._prepare_template_context(context)
         
-        # Contexto base
-        template_context = {
-            "entity": entity,
-            "entity_name": entity.name,
-            "entity_name_lower": entity.name.lower(),
-            "table_name": entity.table_name or f"{entity.name.lower()}s",
-            "fields": entity.fields,
-            "framework": context.framework,
-            "database": context.database,
-            "architecture": context.architecture,
-            "features": context.features,
-            "config": context.config
-        }
+        for template in self._load_relevant_templates(context):
+            try:
+                code = template.render(template_context)
+            except Exception as e:
+                raise RuntimeError(f"Error generando {template.name}: {e}")
+            
+            yield template.get_output_path(context), code.encode('utf-8')
+    
+    def write_files(self, context: GenerationContext) -> List[str]:
+        """Genera y escribe los archivos bajo context.output_path a medida que se renderizan"""
         
-        # Agregar utilidades
-        template_context.update({
-            "primary_key_field": self._get_primary_key_field(entity),
-            "required_fields": [f for f in entity.fields if not f.nullable],
-            "optional_fields": [f for f in entity.fields if f.nullable],
-            "unique_fields": [f for f in entity.fields if f.unique],
-            "indexed_fields": [f for f in entity.fields if f.index],
-            "string_fields": [f for f in entity.fields if f.type == "string"],
-            "numeric_fields": [f for f in entity.fields if f.type in ["integer", "float"]],
-        })
+        written_files = []
         
-        # Configuraciones específicas por feature
-        if "auth" in context.features:
-            template_context["include_auth"] = True
-            template_context["auth_dependency"] = "get_current_user"
+        for output_path, data in self.generate_iter(context):
+            target = os.path.join(context.output_path, output_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+            written_files.append(target)
         
-        if "pagination" in context.features:
-            template_context["include_pagination"] = True
+        return written_files
+    
+    def _load_relevant_templates(self, context: GenerationContext) -> List[CodeTemplate]:
+        """Retorna las plantillas relevantes ya compiladas"""
+        templates = []
+        for template_name in self._get_relevant_templates(context):
+            try:
+                templates.append(self._get_template(template_name))
+            except Exception as e:
+                raise RuntimeError(f"Error generando {template_name}: {e}")
+        return templates
+    
+    def _get_relevant_templates(self, context: GenerationContext) -> Mapping[str, CodeTemplate]:
+        """Filtra las plantillas aplicables al contexto (cacheado por framework, solo lectura)"""
+        relevant_templates = self._relevant_templates.get(context.framework)
+        if relevant_templates is None:
+            relevant_templates = MappingProxyType({
+                name: template for name, template in self.templates.items()
+                if self._is_template_relevant(name, context.framework)
+            })
+            self._relevant_templates[context.framework] = relevant_templates
+        return relevant_templates
+    
+    def _is_template_relevant(self, template_name: str, framework: str) -> bool:
+        """Plantillas del framework actual o no ligadas a ningún framework soportado"""
+        scope = template_name.split('/', 1)[0]
+        return scope == framework or scope not in self.get_supported_frameworks()
+    
+    def _prepare_template_context(self, context: GenerationContext) -> Mapping[str, Any]:
+        """Prepara el contexto para las plantillas"""
+        return ChainMap(
+            {"config": context.config},
+            self._entity_context(context.entity),
+            self._static_context(context),
+        )
+    
+    def _static_context(self, context: GenerationContext) -> Mapping[str, Any]:
+        """Contexto de framework/arquitectura/features, cacheado y de solo lectura"""
+        features = tuple(context.features)
+        key = (context.framework, context.database, context.architecture, features)
+        static_context = self._static_contexts.get(key)
+        if static_context is not None:
+            return static_context
         
-        if "soft_delete" in context.features:
-            template_context["include_soft_delete"] = True
+        # Configuraciones específicas por feature (siempre presentes), derivadas
+        # de las mismas features que la clave
+        mask = _features_to_mask(features)
+        include_auth = bool(mask & _FEATURE_AUTH)
+        static_context = {
+            "framework": context.framework,
+            "database": context.database,
+            "architecture": context.architecture,
+            "features": list(features),
+            "include_auth": include_auth,
+            "auth_dependency": "get_current_user" if include_auth else None,
+            "include_pagination": bool(mask & _FEATURE_PAGINATION),
+            "include_soft_delete": bool(mask & _FEATURE_SOFT_DELETE),
+        }
         
-        return template_context
\ No newline at end of file
+        static_context = MappingProxyType(static_context)
+        self._static_contexts[key] = static_context
+        return static_context
+    
+    def _entity_context(self, entity: EntityDefinition) -> Mapping[str, Any]:
+        """Contexto específico de la entidad (cacheado en la propia entidad)"""
+        return entity._template_context